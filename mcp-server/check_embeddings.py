@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Spot-check retrieval with the quantized ONNX query model against FP32.
+
+The knowledge base is indexed with FP32 PyTorch embeddings, while the server
+embeds queries with the quantized ONNX build. For each sample query this
+searches the collection with both query embeddings and prints their cosine
+similarity and how many of the top-k results they share.
+
+Usage:
+    python check_embeddings.py [query ...]
+"""
+
+import sys
+
+import chromadb
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+from mcp_server.vector_store import (
+    COLLECTION_NAME,
+    EMBED_MODEL,
+    PERSIST_DIR,
+    embedding_model_kwargs,
+)
+
+TOP_K = 10
+
+SAMPLE_QUERIES = [
+    "INT 21h DOS functions",
+    "open a file handle",
+    "set video mode",
+    "read keyboard input without echo",
+    "allocate memory block",
+    "get system date and time",
+    "disk sector read BIOS",
+    "terminate and stay resident",
+    "serial port initialization",
+    "print screen interrupt",
+]
+
+
+def main() -> None:
+    queries = sys.argv[1:] or SAMPLE_QUERIES
+    fp32 = SentenceTransformer(EMBED_MODEL)
+    quant = SentenceTransformer(EMBED_MODEL, **embedding_model_kwargs())
+    col = chromadb.PersistentClient(path=PERSIST_DIR).get_collection(COLLECTION_NAME)
+    if col.count() == 0:
+        print("Collection is empty.")
+        sys.exit(1)
+
+    ref = fp32.encode(queries, normalize_embeddings=True)
+    new = quant.encode(queries, normalize_embeddings=True)
+    k = min(TOP_K, col.count())
+    ref_ids = col.query(query_embeddings=ref.tolist(), n_results=k)["ids"]
+    new_ids = col.query(query_embeddings=new.tolist(), n_results=k)["ids"]
+
+    print(f"{'COSINE':>7}  {'OVERLAP@' + str(k):>10}  QUERY")
+    print("-" * 60)
+    overlaps = []
+    for query, a, b, ra, rb in zip(queries, ref, new, ref_ids, new_ids):
+        overlap = len(set(ra) & set(rb)) / k
+        overlaps.append(overlap)
+        print(f"{float(np.dot(a, b)):>7.4f}  {overlap:>10.0%}  {query}")
+    print(f"\nMean overlap@{k}: {sum(overlaps) / len(overlaps):.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,33 +4,73 @@
 Usage:
     python manage_tokens.py add "description of who this is for"
     python manage_tokens.py list
-    python manage_tokens.py revoke <token>
+    python manage_tokens.py revoke <token | sha256 | sha256 prefix>
+
+tokens.json is keyed by the SHA-256 hex digest of each token; the raw token is
+printed once by `add` and never stored. The server only needs membership, so
+the digests are also written one per line to tokens.txt, which is what the auth
+middleware reads; tokens.json keeps the descriptions. Both live in tokens/,
+the directory bind-mounted into the container.
 """
 
+import hashlib
 import json
+import os
+import re
 import secrets
 import sys
 from pathlib import Path
 
-TOKENS_FILE = Path(__file__).parent / "tokens.json"
+TOKENS_DIR = Path(__file__).parent / "tokens"
+TOKENS_FILE = TOKENS_DIR / "tokens.json"
+TOKENS_INDEX = TOKENS_DIR / "tokens.txt"
+
+# Where tokens.json lived when it was bind-mounted as a single file
+_LEGACY_FILE = Path(__file__).parent / "tokens.json"
+
+_HASH_RE = re.compile(r"[0-9a-f]{64}")
+
+
+def _hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
 
 
 def _load() -> dict:
-    if TOKENS_FILE.exists():
-        return json.loads(TOKENS_FILE.read_text())
-    return {}
+    if not TOKENS_FILE.exists() and _LEGACY_FILE.is_file():
+        TOKENS_DIR.mkdir(exist_ok=True)
+        _LEGACY_FILE.rename(TOKENS_FILE)
+        print(f"Moved {_LEGACY_FILE.name} to {TOKENS_FILE}")
+    if not TOKENS_FILE.exists():
+        return {}
+    tokens = json.loads(TOKENS_FILE.read_text())
+    # Upgrade files written before tokens were stored hashed or indexed
+    legacy = [t for t in tokens if not _HASH_RE.fullmatch(t)]
+    if legacy or not TOKENS_INDEX.exists():
+        for token in legacy:
+            tokens[_hash(token)] = tokens.pop(token)
+        _save(tokens)
+    return tokens
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    # Readers never see a truncated file: write a sibling, then rename over
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(text)
+    os.replace(tmp, path)
 
 
 def _save(tokens: dict) -> None:
-    TOKENS_FILE.write_text(json.dumps(tokens, indent=2) + "\n")
+    TOKENS_DIR.mkdir(exist_ok=True)
+    _write_atomic(TOKENS_FILE, json.dumps(tokens, indent=2) + "\n")
+    _write_atomic(TOKENS_INDEX, "".join(f"{token_hash}\n" for token_hash in tokens))
 
 
 def cmd_add(description: str) -> None:
     tokens = _load()
     token = secrets.token_urlsafe(32)
-    tokens[token] = {"description": description}
+    tokens[_hash(token)] = {"description": description}
     _save(tokens)
-    print(f"Token created:\n  {token}\n  Description: {description!r}")
+    print(f"Token created (shown only once, store it now):\n  {token}\n  Description: {description!r}")
 
 
 def cmd_list() -> None:
@@ -38,17 +78,36 @@ def cmd_list() -> None:
     if not tokens:
         print("No tokens.")
         return
-    print(f"{'TOKEN (first 16 chars)':<20}  DESCRIPTION")
+    print(f"{'SHA-256 (first 16 chars)':<20}  DESCRIPTION")
     print("-" * 60)
-    for token, meta in tokens.items():
-        print(f"  {token[:16]}...  {meta.get('description', '')}")
+    for token_hash, meta in tokens.items():
+        print(f"  {token_hash[:16]}...  {meta.get('description', '')}")
     print(f"\nTotal: {len(tokens)}")
 
 
-def cmd_revoke(token: str) -> None:
+_MIN_PREFIX = 8
+
+
+def _find(tokens: dict, key: str) -> str | None:
+    """Resolve a raw token, a full hash or a unique hash prefix (as shown by list)."""
+    token_hash = _hash(key)
+    if token_hash in tokens:
+        return token_hash
+    prefix = key.rstrip(".").lower()
+    if len(prefix) < _MIN_PREFIX or not re.fullmatch(r"[0-9a-f]+", prefix):
+        return None
+    matches = [h for h in tokens if h.startswith(prefix)]
+    if len(matches) > 1:
+        print(f"Hash prefix {prefix!r} is ambiguous ({len(matches)} matches).")
+        sys.exit(1)
+    return matches[0] if matches else None
+
+
+def cmd_revoke(key: str) -> None:
     tokens = _load()
-    if token in tokens:
-        desc = tokens.pop(token).get("description", "")
+    token_hash = _find(tokens, key)
+    if token_hash is not None:
+        desc = tokens.pop(token_hash).get("description", "")
         _save(tokens)
         print(f"Revoked token for: {desc!r}")
     else:
@@ -71,7 +130,7 @@ def main() -> None:
         cmd_list()
     elif cmd == "revoke":
         if len(sys.argv) < 3:
-            print("Usage: manage_tokens.py revoke <token>")
+            print("Usage: manage_tokens.py revoke <token | sha256 | sha256 prefix>")
             sys.exit(1)
         cmd_revoke(sys.argv[2])
     else:
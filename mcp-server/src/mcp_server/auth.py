@@ -1,40 +1,87 @@
 """Token-based authentication middleware."""
 
-import json
+import hashlib
 from pathlib import Path
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
-TOKENS_FILE = Path("/app/tokens.json")
+# One SHA-256 hex digest per line, written by manage_tokens.py alongside tokens.json
+# into the bind-mounted tokens/ directory
+TOKENS_INDEX = Path("/app/tokens/tokens.txt")
 
-# Paths accessible without a token
-_PUBLIC = {("/", "GET"), ("/health", "GET")}
+# Paths accessible without a token, mapped to the methods allowed on them
+_PUBLIC: dict[str, frozenset[str]] = {
+    "/": frozenset({"GET"}),
+    "/health": frozenset({"GET"}),
+}
 
+_UNAUTHORIZED = JSONResponse({"error": "Unauthorized"}, status_code=401)
 
-def _load_tokens() -> dict:
+_BEARER = b"Bearer "
+_BEARER_LEN = len(_BEARER)
+
+# SHA-256 hex digests of valid tokens, reloaded only when tokens.txt changes.
+# The key is (mtime_ns, size, inode) rather than mtime alone, so a read that
+# races a rewrite within one timestamp tick is not cached indefinitely.
+_token_hashes: set[str] = set()
+_tokens_key: tuple[int, int, int] | None = None
+
+
+def _load_tokens() -> set[str]:
+    """Return the set of token hashes, re-reading tokens.txt only if it changed."""
+    global _token_hashes, _tokens_key
     try:
-        return json.loads(TOKENS_FILE.read_text())
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+        st = TOKENS_INDEX.stat()
+    except OSError:
+        _token_hashes, _tokens_key = set(), None
+        return _token_hashes
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    if key != _tokens_key:
+        try:
+            _token_hashes = set(TOKENS_INDEX.read_text().split())
+        except OSError:  # vanished, or not a regular file (e.g. a directory)
+            _token_hashes = set()
+        _tokens_key = key
+    return _token_hashes
+
+
+def is_valid_token(token: bytes) -> bool:
+    # Only sha256(token) is stored; the raw token never touches disk
+    return hashlib.sha256(token).hexdigest() in _load_tokens()
+
+
+def _authorization(scope: Scope) -> bytes:
+    """Return the raw Authorization header from the ASGI scope, or b"" if absent."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            return value
+    return b""
 
 
-def is_valid_token(token: str) -> bool:
-    return token in _load_tokens()
+class AuthMiddleware:
+    """Pure ASGI middleware: reads path, method and headers straight from the scope."""
 
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
 
-class AuthMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        if (request.url.path, request.method) in _PUBLIC:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
 
-        auth = request.headers.get("Authorization", "")
-        if not auth.startswith("Bearer "):
-            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+        # Nearly all traffic is POST /mcp with a valid token, so check that first;
+        # the public-path table only matters for requests that fail auth.
+        # Header names in the ASGI scope are already lower-cased bytes
+        auth = _authorization(scope)
+        if (
+            len(auth) > _BEARER_LEN
+            and auth.startswith(_BEARER)
+            and is_valid_token(auth[_BEARER_LEN:].strip())
+        ):
+            return await self.app(scope, receive, send)
 
-        token = auth[7:].strip()
-        if not is_valid_token(token):
-            return JSONResponse({"error": "Unauthorized"}, status_code=401)
+        methods = _PUBLIC.get(scope["path"])
+        if methods is not None and scope["method"] in methods:
+            return await self.app(scope, receive, send)
 
-        return await call_next(request)
+        return await _UNAUTHORIZED(scope, receive, send)
@@ -12,13 +12,18 @@ Traefik strips the /mcp prefix before forwarding here:
   POST thelp.neburalis.space/mcp/mcp    → POST /mcp    MCP JSON-RPC (auth)
 """
 
+import gzip
+import re
+from contextlib import asynccontextmanager
+
 from starlette.requests import Request
-from starlette.responses import HTMLResponse, JSONResponse
+from starlette.responses import JSONResponse, Response
 from starlette.routing import Route
+from starlette.types import ASGIApp, Receive, Scope, Send
 from mcp.server.fastmcp import FastMCP
 
 from .auth import AuthMiddleware
-from .tools import register_tools
+from .tools import close_http, init_store, register_tools
 
 # ---------------------------------------------------------------------------
 # Info page (served at GET / without auth)
@@ -60,6 +65,7 @@ Content-Type: application/json</pre>
   <h2>Available Tools</h2>
   <ul>
     <li><code>search_knowledge(query, n_results=5)</code> &mdash; semantic search over site documentation</li>
+    <li><code>search_knowledge_batch(queries, n_results=5)</code> &mdash; up to 32 searches in one call, one <code>{query, results}</code> entry per query</li>
     <li><code>list_collections()</code> &mdash; list available collections</li>
     <li><code>get_page(page_num)</code> &mdash; fetch raw HTML of a page by its number</li>
   </ul>
@@ -71,21 +77,88 @@ Content-Type: application/json</pre>
 """
 
 
-async def _info_page(request: Request) -> HTMLResponse:
-    return HTMLResponse(_INFO_HTML)
+def _minify_html(html: str) -> str:
+    """Collapse inter-tag and repeated whitespace, leaving <pre> blocks untouched."""
+    parts = re.split(r"(<pre>.*?</pre>)", html, flags=re.DOTALL)
+    for i in range(0, len(parts), 2):
+        parts[i] = re.sub(r"\s+", " ", re.sub(r">\s+<", "><", parts[i])).strip()
+    return "".join(parts)
+
+
+_INFO_HTML = _minify_html(_INFO_HTML)
+
+# The page is constant, so encode, compress and build both responses once
+_INFO_BYTES = _INFO_HTML.encode("utf-8")
+_INFO_GZ = gzip.compress(_INFO_BYTES, 9)
+_INFO_HEADERS = {"Cache-Control": "public, max-age=3600", "Vary": "Accept-Encoding"}
+_INFO_RESP = Response(
+    content=_INFO_BYTES,
+    media_type="text/html; charset=utf-8",
+    headers=_INFO_HEADERS,
+)
+_INFO_RESP_GZ = Response(
+    content=_INFO_GZ,
+    media_type="text/html; charset=utf-8",
+    headers={**_INFO_HEADERS, "Content-Encoding": "gzip"},
+)
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True if Accept-Encoding allows gzip with q > 0 (explicitly or via "*")."""
+    qvalues = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qvalues[coding.strip().lower()] = q
+    return qvalues.get("gzip", qvalues.get("*", 0.0)) > 0
+
+
+async def _info_page(request: Request) -> Response:
+    if _accepts_gzip(request.headers.get("Accept-Encoding", "")):
+        return _INFO_RESP_GZ
+    return _INFO_RESP
 
 
 async def _health(request: Request) -> JSONResponse:
     return JSONResponse({"status": "ok"})
 
 
+class _ExactRoutes:
+    """ASGI shim that dispatches exact-match paths with one dict lookup.
+
+    Anything it does not own (including a wrong method on an owned path) falls
+    through to the wrapped app, whose router still has the same routes and so
+    still produces the proper 405.
+    """
+
+    def __init__(self, app: ASGIApp, routes: list[Route]) -> None:
+        self.app = app
+        self.routes = {route.path: route for route in routes}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            route = self.routes.get(scope["path"])
+            if route is not None and scope["method"] in route.methods:
+                return await route.app(scope, receive, send)
+        return await self.app(scope, receive, send)
+
+
 # ---------------------------------------------------------------------------
 # Build the app
 #
 # We take FastMCP's own Starlette app (which has the lifespan that starts the
 # anyio task group for StreamableHTTPSessionManager) and:
-#   1. Prepend our custom routes so they match before /mcp
+#   1. Serve our custom routes from a dict lookup in front of the router,
+#      leaving /mcp first in the router's own list
 #   2. Add the auth middleware
+#   3. Warm the vector store on startup, close the httpx client on shutdown
 # ---------------------------------------------------------------------------
 # host="0.0.0.0" prevents FastMCP from auto-enabling DNS rebinding protection
 # (which by default only allows localhost). We run behind Traefik+TLS, so this
@@ -96,11 +169,30 @@ register_tools(_mcp)
 # FastMCP's Starlette app — has the correct lifespan and a Route("/mcp", ...)
 app = _mcp.streamable_http_app()
 
-# Insert custom routes at the front so they take priority
-app.router.routes = [
+# Wrap FastMCP's lifespan to create the vector store at startup and close the
+# shared httpx client on shutdown
+_mcp_lifespan = app.router.lifespan_context
+
+
+@asynccontextmanager
+async def _lifespan(app):
+    init_store()
+    try:
+        async with _mcp_lifespan(app) as state:
+            yield state
+    finally:
+        await close_http()
+
+
+app.router.lifespan_context = _lifespan
+
+_routes = [
     Route("/", _info_page, methods=["GET"]),
     Route("/health", _health, methods=["GET"]),
-] + list(app.router.routes)
+]
+# Appended (in place) so the router still answers wrong-method requests
+app.router.routes.extend(_routes)
+app.add_middleware(_ExactRoutes, routes=_routes)
 
 # Auth middleware — skips GET / and GET /health (see auth.py)
 app.add_middleware(AuthMiddleware)
@@ -1,14 +1,21 @@
 """MCP tool definitions — registered onto a FastMCP instance."""
 
+from pathlib import Path
+
 import httpx
+import orjson
 from mcp.server.fastmcp import FastMCP
 
 from .vector_store import VectorStore
 
 _BASE_URL = "https://thelp.neburalis.space"
 
+# Parsed pages.json plus its validators, kept across restarts
+_PAGES_CACHE = Path("/tmp/pages_map.json")
+
 _store: VectorStore | None = None
 _pages_map: dict[int, str] | None = None  # page_num -> filename (e.g. "42-foo.html")
+_http: httpx.AsyncClient | None = None
 
 
 def _get_store() -> VectorStore:
@@ -18,58 +25,151 @@ def _get_store() -> VectorStore:
     return _store
 
 
+def init_store() -> None:
+    """Create the vector store up front so its warmup overlaps server startup."""
+    _get_store()
+
+
+def _get_http() -> httpx.AsyncClient:
+    """Shared keep-alive client so page fetches reuse one pooled HTTP/2 connection."""
+    global _http
+    if _http is None:
+        _http = httpx.AsyncClient(
+            base_url=_BASE_URL,
+            http2=True,
+            follow_redirects=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _http
+
+
+async def close_http() -> None:
+    global _http
+    if _http is not None:
+        await _http.aclose()
+        _http = None
+
+
+def _read_pages_cache() -> dict | None:
+    """Load the on-disk cache, treating anything malformed as a miss."""
+    try:
+        cached = orjson.loads(_PAGES_CACHE.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if not isinstance(cached, dict):
+        return None
+    etag, last_modified = cached.get("etag"), cached.get("last_modified")
+    pages_map = cached.get("pages_map")
+    if not all(v is None or isinstance(v, str) for v in (etag, last_modified)):
+        return None
+    if not isinstance(pages_map, dict):
+        return None
+    try:
+        # JSON object keys are strings; page numbers go back to int
+        pages_map = {int(num): name for num, name in pages_map.items()}
+    except ValueError:
+        return None
+    if not all(isinstance(name, str) for name in pages_map.values()):
+        return None
+    return {"etag": etag, "last_modified": last_modified, "pages_map": pages_map}
+
+
+def _write_pages_cache(cached: dict) -> None:
+    try:
+        _PAGES_CACHE.write_bytes(orjson.dumps(cached, option=orjson.OPT_NON_STR_KEYS))
+    except OSError:
+        pass
+
+
 async def _get_pages_map() -> dict[int, str]:
-    """Fetch pages.json once and cache a page-number → filename mapping."""
+    """Fetch pages.json once and cache a page-number → filename mapping.
+
+    The parsed mapping is also persisted to disk together with the response's
+    ETag / Last-Modified, so a restarted process only issues a conditional GET
+    and reuses the stored mapping on 304.
+    """
     global _pages_map
     if _pages_map is None:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(f"{_BASE_URL}/pages.json")
+        cached = _read_pages_cache()
+        headers = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+        resp = await _get_http().get("/pages.json", headers=headers)
+        if resp.status_code == 304 and cached is not None:
+            _pages_map = cached["pages_map"]
+        else:
             resp.raise_for_status()
-            pages = resp.json()
-        _pages_map = {int(entry["id"].split("-")[0]): entry["id"] for entry in pages}
+            pages = orjson.loads(resp.content)
+            _pages_map = {int(entry["id"].split("-")[0]): entry["id"] for entry in pages}
+            _write_pages_cache(
+                {
+                    "etag": resp.headers.get("ETag"),
+                    "last_modified": resp.headers.get("Last-Modified"),
+                    "pages_map": _pages_map,
+                }
+            )
     return _pages_map
 
 
-def register_tools(mcp: FastMCP) -> None:
+async def search_knowledge(query: str, n_results: int = 5) -> list[dict]:
+    """Search the knowledge base for documents semantically similar to the query.
+
+    Args:
+        query: Natural-language search query.
+        n_results: Maximum number of results to return (default 5).
+
+    Returns:
+        List of dicts with keys: id, content, metadata, distance.
+    """
+    return await _get_store().search(query, n_results)
+
+
+async def search_knowledge_batch(queries: list[str], n_results: int = 5) -> list[dict]:
+    """Run several semantic searches at once; cheaper than repeated search_knowledge calls.
+
+    Args:
+        queries: Natural-language search queries (at most 32).
+        n_results: Maximum number of results to return per query (default 5).
 
-    @mcp.tool()
-    async def search_knowledge(query: str, n_results: int = 5) -> list[dict]:
-        """Search the knowledge base for documents semantically similar to the query.
-
-        Args:
-            query: Natural-language search query.
-            n_results: Maximum number of results to return (default 5).
-
-        Returns:
-            List of dicts with keys: id, content, metadata, distance.
-        """
-        return await _get_store().search(query, n_results)
-
-    @mcp.tool()
-    async def list_collections() -> list[str]:
-        """List all collections available in the vector store.
-
-        Returns:
-            List of collection name strings.
-        """
-        return _get_store().list_collections()
-
-    @mcp.tool()
-    async def get_page(page_num: int) -> str:
-        """Fetch a TECH Help! documentation page by its page number and return the raw HTML.
-
-        Args:
-            page_num: Page number (e.g. 100 for page 100). Matches the numeric
-                      prefix returned in search_knowledge results.
-
-        Returns:
-            Raw HTML content of the page as a string.
-        """
-        pages_map = await _get_pages_map()
-        filename = pages_map.get(page_num)
-        if filename is None:
-            raise ValueError(f"Page {page_num} not found")
-        async with httpx.AsyncClient(follow_redirects=True, timeout=10.0) as client:
-            response = await client.get(f"{_BASE_URL}/pages/{filename}")
-            response.raise_for_status()
-            return response.text
+    Returns:
+        One dict per query, in order, with keys: query (the query string) and
+        results (list of dicts with keys: id, content, metadata, distance).
+    """
+    return await _get_store().search_batch(queries, n_results)
+
+
+async def list_collections() -> list[str]:
+    """List all collections available in the vector store.
+
+    Returns:
+        List of collection name strings.
+    """
+    return await _get_store().list_collections()
+
+
+async def get_page(page_num: int) -> str:
+    """Fetch a TECH Help! documentation page by its page number and return the raw HTML.
+
+    Args:
+        page_num: Page number (e.g. 100 for page 100). Matches the numeric
+                  prefix returned in search_knowledge results.
+
+    Returns:
+        Raw HTML content of the page as a string.
+    """
+    pages_map = await _get_pages_map()
+    filename = pages_map.get(page_num)
+    if filename is None:
+        raise ValueError(f"Page {page_num} not found")
+    response = await _get_http().get(f"/pages/{filename}")
+    response.raise_for_status()
+    return response.text
+
+
+def register_tools(mcp: FastMCP) -> None:
+    for tool in (search_knowledge, search_knowledge_batch, list_collections, get_page):
+        mcp.tool()(tool)
@@ -1,61 +1,126 @@
-"""ChromaDB wrapper with sentence-transformers embeddings."""
+"""ChromaDB wrapper with sentence-transformers embeddings (int8 ONNX backend)."""
 
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import partial
 
 import chromadb
 from chromadb.utils.embedding_functions import SentenceTransformerEmbeddingFunction
 
-_COLLECTION_NAME = "knowledge_base"
-_EMBED_MODEL = "all-MiniLM-L6-v2"
-_PERSIST_DIR = "/data/chroma"
+COLLECTION_NAME = "knowledge_base"
+EMBED_MODEL = "all-MiniLM-L6-v2"
+# Dynamically quantized (uint8, AVX2 preset) build published in the model repo,
+# run through ONNX Runtime's CPU provider. The name must match a file that exists:
+# sentence-transformers silently falls back to an uncached FP32 export otherwise.
+EMBED_ONNX_FILE = "onnx/model_quint8_avx2.onnx"
+PERSIST_DIR = "/data/chroma"
+
+# Upper bound on queries per search_batch call; the batch holds the single
+# worker for its whole duration, so every other search queues behind it
+MAX_BATCH_QUERIES = 32
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_model_kwargs() -> dict:
+    """SentenceTransformer kwargs that select the quantized ONNX build on CPU."""
+    return {
+        "backend": "onnx",
+        "model_kwargs": {"file_name": EMBED_ONNX_FILE, "provider": "CPUExecutionProvider"},
+    }
+
+
+def _log_failure(what: str):
+    def callback(future: Future) -> None:
+        exc = future.exception()
+        if exc is not None:
+            logger.error("Vector store %s failed", what, exc_info=exc)
+
+    return callback
 
 
 class VectorStore:
-    def __init__(self, persist_dir: str = _PERSIST_DIR) -> None:
-        self._executor = ThreadPoolExecutor(max_workers=2)
-        ef = SentenceTransformerEmbeddingFunction(model_name=_EMBED_MODEL)
+    def __init__(self, persist_dir: str = PERSIST_DIR) -> None:
+        # A single worker keeps one copy of the model's per-thread state warm;
+        # ONNX Runtime parallelises each inference across cores internally
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vs")
+        # Model load, client open and warmup all run on the worker, so __init__
+        # never blocks the event loop. The worker is FIFO, so every later call
+        # queues behind them.
+        self._opened = self._executor.submit(self._open, persist_dir)
+        self._opened.add_done_callback(_log_failure("open"))
+        self._executor.submit(self._warmup).add_done_callback(_log_failure("warmup"))
+
+    def _open(self, persist_dir: str) -> None:
+        self._ef = SentenceTransformerEmbeddingFunction(model_name=EMBED_MODEL, **embedding_model_kwargs())
         self._client = chromadb.PersistentClient(path=persist_dir)
         self._col = self._client.get_or_create_collection(
-            name=_COLLECTION_NAME,
-            embedding_function=ef,
+            name=COLLECTION_NAME,
+            embedding_function=self._ef,
             metadata={"hnsw:space": "cosine"},
         )
 
+    def _warmup(self) -> None:
+        """Run a throwaway query so the first real search hits a warm model and index."""
+        if self._opened.exception() is not None:
+            return  # already logged by the open callback
+        self._ef(["warmup"])
+        if self._col.count() > 0:
+            self._col.query(query_texts=["warmup"], n_results=1)
+
+    def _query(self, queries: list[str], n_results: int) -> dict:
+        # Runs on the worker after _open; re-raises its error if it failed
+        self._opened.result()
+        return self._col.query(query_texts=queries, n_results=n_results)
+
+    def _list_collections(self) -> list[str]:
+        self._opened.result()
+        return [c.name for c in self._client.list_collections()]
+
     # ------------------------------------------------------------------
     # Async helpers
     # ------------------------------------------------------------------
 
     async def _run(self, fn, *args, **kwargs):
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        loop = asyncio.get_running_loop()
+        if kwargs:
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        return await loop.run_in_executor(self._executor, fn, *args)
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _format(result: dict, i: int) -> list[dict]:
+        """Turn the i-th query's columns of a Chroma result into result dicts."""
+        ids = result["ids"][i]
+        docs = result["documents"][i]
+        metas = result["metadatas"][i]
+        dists = result["distances"][i]
+        return [
+            {"id": doc_id, "content": doc, "metadata": meta or {}, "distance": round(dist, 4)}
+            for doc_id, doc, meta, dist in zip(ids, docs, metas, dists)
+        ]
+
     async def search(self, query: str, n_results: int = 5) -> list[dict]:
-        count = await self._run(self._col.count)
-        if count == 0:
+        # Chroma clamps n_results to the collection size itself and returns
+        # empty lists for an empty collection, so no count() round trip is needed
+        result = await self._run(self._query, [query], n_results)
+        return self._format(result, 0)
+
+    async def search_batch(self, queries: list[str], n_results: int = 5) -> list[dict]:
+        """Run several queries in one call so they are embedded as a single batch.
+
+        Returns one {"query", "results"} dict per query, in order.
+        """
+        if len(queries) > MAX_BATCH_QUERIES:
+            raise ValueError(f"At most {MAX_BATCH_QUERIES} queries per batch, got {len(queries)}")
+        if not queries:
             return []
-        n = min(n_results, count)
-        result = await self._run(
-            self._col.query,
-            query_texts=[query],
-            n_results=n,
-        )
-        output = []
-        for i, doc_id in enumerate(result["ids"][0]):
-            output.append(
-                {
-                    "id": doc_id,
-                    "content": result["documents"][0][i],
-                    "metadata": result["metadatas"][0][i] or {},
-                    "distance": round(result["distances"][0][i], 4),
-                }
-            )
-        return output
-
-    def list_collections(self) -> list[str]:
-        return [c.name for c in self._client.list_collections()]
+        result = await self._run(self._query, queries, n_results)
+        return [{"query": q, "results": self._format(result, i)} for i, q in enumerate(queries)]
+
+    async def list_collections(self) -> list[str]:
+        return await self._run(self._list_collections)